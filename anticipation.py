@@ -0,0 +1,83 @@
+# ==========================================
+# ⚡ PRÉCALCUL SPÉCULATIF DES FICHES VOISINES
+# ==========================================
+# Après l'affichage d'une fiche, les poids voisins (boutons ±0.5 kg) et les
+# âges adjacents sont calculés en arrière-plan dans le cache partagé, avec en
+# option le PDF. Une nouvelle saisie rend les précalculs en attente obsolètes
+# (ils sont abandonnés) et le nombre de tâches en cours par session est plafonné.
+#
+# PDF (PEDICALCUL_ANTICIPER_PDF=1) : une fois le logo décodé, un PDF ne coûte
+# que ~10 ms, mais ce temps tient le GIL et une tâche déjà démarrée va à son
+# terme même si la saisie a changé. Le premier décodage du logo (~3 s) n'est
+# jamais fait en arrière-plan : tant que le premier téléchargement ne l'a pas
+# fait, seules les fiches sont précalculées. Option désactivée par défaut, le
+# gain (~10 ms par clic) étant faible face au calcul des fiches.
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from rendu_pdf import logo_pret
+
+MAX_VOISINS = 6        # Fiches précalculées par saisie
+MAX_EN_COURS = 12      # Tâches en attente ou en cours par session
+PAS_POIDS = 0.5        # Pas des boutons du champ "Poids RETENU"
+ANTICIPER_PDF = os.environ.get("PEDICALCUL_ANTICIPER_PDF", "0") == "1"
+
+_executeur = ThreadPoolExecutor(max_workers=2, thread_name_prefix="anticipation")
+
+
+def voisins(poids, total_months, estimer, ages_possibles):
+    """Saisies probables suivantes, de la plus à la moins probable.
+
+    estimer(mois) donne le poids proposé quand l'âge change (le champ poids
+    est alors réinitialisé) ; ages_possibles liste les âges adjacents.
+    """
+    candidats = [(round(poids + PAS_POIDS, 1), total_months), (round(poids - PAS_POIDS, 1), total_months)]
+    candidats += [(round(estimer(mois), 1), mois) for mois in ages_possibles]
+    candidats += [(round(poids + 2 * PAS_POIDS, 1), total_months), (round(poids - 2 * PAS_POIDS, 1), total_months)]
+    vus = {(poids, total_months)}
+    resultat = []
+    for candidat in candidats:
+        if candidat[0] > 0 and candidat not in vus:
+            vus.add(candidat)
+            resultat.append(candidat)
+    return resultat[:MAX_VOISINS]
+
+
+class Anticipation:
+    """Précalculs d'une session (à garder dans st.session_state)."""
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.generation = 0
+        self.en_cours = 0
+        self._verrou = threading.Lock()
+
+    def anticiper(self, candidats, fabrique_pdf=None):
+        """Lance le précalcul des (poids, mois) ; les précalculs précédents deviennent obsolètes.
+
+        fabrique_pdf(poids, mois) pré-génère le PDF (uniquement si ANTICIPER_PDF).
+        """
+        with self._verrou:
+            self.generation += 1
+            generation = self.generation
+        for poids, total_months in candidats:
+            with self._verrou:
+                if self.en_cours >= MAX_EN_COURS:
+                    break
+                self.en_cours += 1
+            _executeur.submit(self._calculer, generation, poids, total_months,
+                              fabrique_pdf if ANTICIPER_PDF else None)
+
+    def _calculer(self, generation, poids, total_months, fabrique_pdf):
+        try:
+            if generation != self.generation:
+                return
+            self.cache.fiche(poids, total_months)
+            # Dernier contrôle d'obsolescence avant le rendu, seule étape non interruptible
+            if fabrique_pdf is not None and generation == self.generation and logo_pret():
+                fabrique_pdf(poids, total_months)
+        finally:
+            with self._verrou:
+                self.en_cours -= 1
@@ -0,0 +1,162 @@
+# ==========================================
+# 🔐 VÉRIFICATION DES CONNEXIONS
+# ==========================================
+# Les identifiants (st.secrets["passwords"]) sont chargés une seule fois dans
+# un index de hachés PBKDF2 : aucun mot de passe en clair n'est gardé en
+# mémoire. Le hachage, volontairement coûteux, tourne dans un petit pool de
+# threads borné (qui plafonne à lui seul la charge de hachage), et des seaux
+# à jetons par email et par client rejettent les tentatives en excès AVANT
+# tout calcul coûteux.
+#
+# Derrière un reverse proxy, renseigner son adresse (127.0.0.1 s'il tourne sur
+# la même machine) dans PEDICALCUL_PROXIES="ip1,ip2" : l'en-tête
+# X-Forwarded-For n'est lu que si la connexion vient d'un de ces proxies.
+# Sans cela, une connexion locale ou privée portant cet en-tête (proxy non
+# déclaré) n'est limitée que par email, avec un avertissement dans les logs,
+# plutôt que de faire partager un seul seau à tout le service.
+#
+# Pour stocker un haché plutôt qu'un mot de passe en clair dans les secrets :
+#     python authentification.py "mot de passe"
+
+import hashlib
+import hmac
+import ipaddress
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+ALGORITHME = "pbkdf2_sha256"
+ITERATIONS = 300_000     # ~0.1 s par vérification
+NB_WORKERS = 2           # Vérifications simultanées
+MAX_EN_ATTENTE = 8       # Au-delà, les tentatives sont refusées (serveur occupé)
+
+# Seaux à jetons : (capacité, jetons rendus par seconde)
+SEAU_EMAIL = (5, 1 / 60)     # 5 essais, puis 1 par minute
+SEAU_CLIENT = (20, 1 / 15)   # 20 essais, puis 1 toutes les 15 s
+MAX_SEAUX = 10_000           # Par type de seau (LRU : les plus anciens sont oubliés)
+
+PROXIES = frozenset(ip.strip() for ip in os.environ.get("PEDICALCUL_PROXIES", "").split(",") if ip.strip())
+BOUCLE_LOCALE = "127.0.0.1"
+
+journal = logging.getLogger(__name__)
+_proxy_signale = threading.Event()  # Avertissement "proxy non déclaré" émis une seule fois
+
+
+class ServeurOccupe(Exception):
+    """Trop de vérifications en attente : tentative refusée sans calcul."""
+
+
+def hacher(mot_de_passe, sel=None, iterations=ITERATIONS):
+    sel = sel or os.urandom(16)
+    hache = hashlib.pbkdf2_hmac("sha256", mot_de_passe.encode("utf-8"), sel, iterations)
+    return f"{ALGORITHME}${iterations}${sel.hex()}${hache.hex()}"
+
+
+def _adresse_interne(adresse):
+    try:
+        ip = ipaddress.ip_address(adresse)
+    except ValueError:
+        return False
+    return ip.is_loopback or ip.is_private
+
+
+def identifier_client(adresse, x_forwarded_for, proxies=PROXIES):
+    """Adresse du client pour le throttling, ou None si elle est inconnue.
+
+    adresse est celle de la connexion (None = boucle locale, comme
+    st.context.ip_address). X-Forwarded-For n'est pris en compte que si la
+    connexion vient d'un proxy de confiance ; il est lu de droite à gauche
+    (chaque proxy ajoute son client à la fin) et le premier saut qui n'est pas
+    un proxy de confiance est le client. Les sauts plus à gauche sont fournis
+    par le client lui-même et ignorés.
+
+    Sans proxy déclaré, une connexion locale ou privée avec X-Forwarded-For
+    vient d'un proxy : tous ses utilisateurs auraient la même adresse, donc
+    None (limitation par email seulement).
+    """
+    adresse = adresse or BOUCLE_LOCALE
+    if adresse not in proxies:
+        if not proxies and x_forwarded_for and _adresse_interne(adresse):
+            if not _proxy_signale.is_set():
+                _proxy_signale.set()
+                journal.warning("Connexion via un proxy non déclaré (%s) : renseigner PEDICALCUL_PROXIES "
+                                "pour limiter les connexions par client.", adresse)
+            return None
+        return adresse
+    for saut in reversed((x_forwarded_for or "").split(",")):
+        saut = saut.strip()
+        if saut and saut not in proxies:
+            return saut
+    return adresse
+
+
+def _verifier_hache(mot_de_passe, stocke):
+    _, iterations, sel, attendu = stocke.split("$")
+    hache = hashlib.pbkdf2_hmac("sha256", mot_de_passe.encode("utf-8"), bytes.fromhex(sel), int(iterations))
+    return hmac.compare_digest(hache.hex(), attendu)
+
+
+class IndexIdentifiants:
+    """Index email -> haché, construit une fois à partir des secrets."""
+
+    def __init__(self, utilisateurs):
+        self._pool = ThreadPoolExecutor(max_workers=NB_WORKERS, thread_name_prefix="auth")
+        self._places = threading.BoundedSemaphore(MAX_EN_ATTENTE)
+        # Les mots de passe encore en clair dans les secrets sont hachés au chargement
+        emails = [email.lower().strip() for email in utilisateurs]
+        valeurs = [str(v) for v in utilisateurs.values()]
+        haches = self._pool.map(lambda v: v if v.startswith(ALGORITHME + "$") else hacher(v), valeurs)
+        self._haches = dict(zip(emails, haches))
+
+    def __contains__(self, email):
+        return email in self._haches
+
+    def verifier(self, email, mot_de_passe):
+        """True / False selon le mot de passe ; lève ServeurOccupe si le pool est saturé."""
+        if not self._places.acquire(blocking=False):
+            raise ServeurOccupe()
+        try:
+            return self._pool.submit(_verifier_hache, mot_de_passe, self._haches[email]).result()
+        finally:
+            self._places.release()
+
+
+class Limiteur:
+    """Seaux à jetons par client (adresse IP) et par email."""
+
+    def __init__(self, seau_email=SEAU_EMAIL, seau_client=SEAU_CLIENT, max_seaux=MAX_SEAUX):
+        self.regles = {"client": seau_client, "email": seau_email}
+        self.max_seaux = max_seaux
+        # Un LRU par type : inonder de clients inventés n'évince pas les seaux des emails
+        self._seaux = {type_cle: OrderedDict() for type_cle in self.regles}  # clé -> (jetons, horodatage)
+        self._verrou = threading.Lock()
+
+    def _prendre(self, type_cle, cle, maintenant):
+        capacite, debit = self.regles[type_cle]
+        seaux = self._seaux[type_cle]
+        jetons, depuis = seaux.get(cle, (capacite, maintenant))
+        jetons = min(capacite, jetons + (maintenant - depuis) * debit)
+        autorise = jetons >= 1
+        seaux[cle] = (jetons - 1 if autorise else jetons, maintenant)
+        seaux.move_to_end(cle)
+        if len(seaux) > self.max_seaux:
+            seaux.popitem(last=False)
+        return autorise
+
+    def autoriser(self, email, client):
+        """Consomme un jeton client (sauf client None) puis email ; False si l'un est vide."""
+        maintenant = time.monotonic()
+        with self._verrou:
+            if client is not None and not self._prendre("client", client, maintenant):
+                return False
+            return self._prendre("email", email, maintenant)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit('Usage : python authentification.py "mot de passe"')
+    print(hacher(sys.argv[1]))
@@ -0,0 +1,140 @@
+# ==========================================
+# 🗃️ CACHE DES FICHES ET INVALIDATION CIBLÉE
+# ==========================================
+# Chaque section calculée est mémorisée par (poids, âge) avec la liste des
+# entrées du formulaire qu'elle a lues. Une mise à jour du formulaire
+# n'invalide que les sections (et PDF) qui dépendent des entrées modifiées,
+# puis les recalcule en arrière-plan pour garder le cache chaud.
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import formulaire
+from calculs import SECTIONS
+
+MAX_FICHES = 2000
+MAX_PDF = 64
+
+
+class CacheFiches:
+    def __init__(self, max_fiches=MAX_FICHES, max_pdf=MAX_PDF):
+        self.max_fiches = max_fiches
+        self.max_pdf = max_pdf
+        self.fiches = OrderedDict()  # (poids, mois) -> {nom section: (sections, clés lues)}
+        self.pdfs = OrderedDict()    # (poids, mois, clé PDF) -> bytes
+        self.version = 0
+        self.historique = []         # [(version, clés modifiées)]
+        self.dernier_rapport = None
+        self._verrou = threading.RLock()
+        self._arriere_plan = ThreadPoolExecutor(max_workers=1, thread_name_prefix="recalcul")
+
+    @staticmethod
+    def _cle(poids, total_months):
+        return (float(poids), int(total_months))
+
+    def _calculer_section(self, section, poids, total_months):
+        with formulaire.suivre_lectures() as lues:
+            resultat = section(poids, total_months)
+        # Tuples : les sections mémorisées sont partagées entre sessions
+        return tuple(resultat), frozenset(lues)
+
+    def fiche(self, poids, total_months):
+        """Sections de la fiche (calculées seulement si absentes du cache)."""
+        cle = self._cle(poids, total_months)
+        with self._verrou:
+            version = self.version
+            entree = self.fiches.get(cle)
+            if entree is not None:
+                self.fiches.move_to_end(cle)
+            entree = dict(entree or {})
+
+        manquantes = [s for s in SECTIONS if s.__name__ not in entree]
+        for section in manquantes:
+            entree[section.__name__] = self._calculer_section(section, *cle)
+
+        if manquantes:
+            with self._verrou:
+                # Ne pas mémoriser un calcul fait avec un formulaire devenu obsolète
+                if version == self.version:
+                    self.fiches[cle] = entree
+                    self.fiches.move_to_end(cle)
+                    while len(self.fiches) > self.max_fiches:
+                        self.fiches.popitem(last=False)
+
+        fiche = []
+        for section in SECTIONS:
+            fiche.extend(entree[section.__name__][0])
+        return fiche
+
+    def pdf(self, poids, total_months, cle_pdf, fabrique):
+        """PDF mémorisé ; fabrique() n'est appelée qu'en cas d'absence.
+
+        cle_pdf doit contenir tout ce que le PDF imprime en plus de la fiche
+        (identité, date de génération), sinon un PDF périmé serait resservi.
+        """
+        cle = self._cle(poids, total_months) + (cle_pdf,)
+        with self._verrou:
+            if cle in self.pdfs:
+                self.pdfs.move_to_end(cle)
+                return self.pdfs[cle]
+            version = self.version
+        contenu = fabrique()
+        with self._verrou:
+            if version == self.version:
+                self.pdfs[cle] = contenu
+                while len(self.pdfs) > self.max_pdf:
+                    self.pdfs.popitem(last=False)
+        return contenu
+
+    def cles_modifiees_depuis(self, version):
+        with self._verrou:
+            return set().union(*[cles for v, cles in self.historique if v > version])
+
+    def mettre_a_jour_formulaire(self, modifications):
+        """Applique une mise à jour du formulaire et invalide les sections concernées.
+
+        Retourne (rapport, future) ; la future se termine quand les sections
+        invalidées ont été recalculées en arrière-plan (résultat : leur nombre).
+        """
+        with self._verrou:
+            changements = formulaire.modifier(modifications)
+            cles = set(changements)
+            invalidees = {}  # (poids, mois) -> [noms de sections]
+            if cles:
+                self.version += 1
+                self.historique.append((self.version, frozenset(cles)))
+                for cle_fiche, entree in self.fiches.items():
+                    noms = [nom for nom, (_, lues) in entree.items() if lues & cles]
+                    for nom in noms:
+                        del entree[nom]
+                    if noms:
+                        invalidees[cle_fiche] = noms
+                for cle_pdf in [c for c in self.pdfs if c[:2] in invalidees]:
+                    del self.pdfs[cle_pdf]
+
+            par_section = {}
+            for noms in invalidees.values():
+                for nom in noms:
+                    par_section[nom] = par_section.get(nom, 0) + 1
+            rapport = {
+                "version": self.version,
+                "modifications": changements,
+                "sections": par_section,
+                "combinaisons": len(invalidees),
+            }
+            self.dernier_rapport = rapport
+
+        future = self._arriere_plan.submit(self._recalculer, list(invalidees))
+        return rapport, future
+
+    def _recalculer(self, cles_fiches):
+        nb = 0
+        for cle in cles_fiches:
+            with self._verrou:
+                entree = self.fiches.get(cle)
+                manquantes = 0 if entree is None else len(SECTIONS) - len(entree)
+            if manquantes:
+                self.fiche(*cle)
+                nb += manquantes
+        return nb
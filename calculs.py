@@ -0,0 +1,712 @@
+# ==========================================
+# 🧮 LOGIQUE MÉDICALE (sans Streamlit)
+# ==========================================
+# Toutes les sections de la fiche sont calculées ici à partir du poids retenu
+# et de l'âge total en mois, pour être réutilisées par la fiche individuelle,
+# le tableau de service et les futurs exports.
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from formulaire import valeur
+
+
+class Tableau(NamedTuple):
+    """Petit tableau immuable (en-têtes + lignes en tuples), sans pandas."""
+    colonnes: tuple       # En-têtes
+    lignes: tuple         # Un tuple de valeurs par ligne
+    alertes: tuple = ()   # Indices des lignes à signaler (dépassement de seuil)
+
+    @classmethod
+    def depuis_colonnes(cls, donnees, alertes=()):
+        return cls(tuple(donnees), tuple(zip(*donnees.values())), tuple(alertes))
+
+    @classmethod
+    def depuis_lignes(cls, lignes, colonnes, alertes=()):
+        return cls(tuple(colonnes), tuple(map(tuple, lignes)), tuple(alertes))
+
+    def vers_dataframe(self, index=None):
+        """Conversion pandas, uniquement pour l'affichage Streamlit."""
+        df = pd.DataFrame(list(self.lignes), columns=list(self.colonnes))
+        return df.set_index(index) if index else df
+
+
+class Section(NamedTuple):
+    cle: str              # Titre utilisé dans le PDF
+    titre: str            # Sous-titre affiché à l'écran ("" = pas de sous-titre)
+    table: Tableau        # Tableau de la section
+    index: str            # Colonne utilisée comme index pour st.table
+    avant: tuple = ()     # Messages ((type, texte), ...) affichés avant le tableau
+    apres: tuple = ()     # Messages ((type, texte), ...) affichés après le tableau
+
+
+# --- ÂGE & POIDS ---
+def decomposer_age(total_months):
+    """Retourne (age_years_float, age_years) comme la saisie exclusive mois/années."""
+    age_years_float = total_months / 12.0
+    # En saisie "Mois (< 2 ans)", age_years vaut 0 (compatibilité métoclopramide)
+    age_years = total_months // 12 if total_months >= 24 else 0
+    return age_years_float, age_years
+
+
+def texte_age(total_months):
+    if total_months < 24:
+        return f"{total_months} mois"
+    return f"{total_months // 12} ans"
+
+
+def estimer_poids(total_months):
+    """Poids APLS basé sur l'âge total (accepte un scalaire ou un tableau numpy)."""
+    total_months = np.asarray(total_months, dtype=float)
+    age_years_float = total_months / 12.0
+    poids = np.select(
+        [total_months < 12, total_months <= 60],
+        [(0.5 * total_months) + 4, (2.0 * age_years_float) + 8],
+        (3.0 * age_years_float) + 7,
+    )
+    return float(poids) if poids.ndim == 0 else poids
+
+
+# --- DOSES CLÉS (scalaires ou tableaux numpy, pour le calcul par lot) ---
+def dose_adre_acr(poids):
+    """Adrénaline ACR : (dose mg, volume ml à la dilution du formulaire)."""
+    dose = np.minimum(np.asarray(poids, dtype=float) * 0.01, valeur("adrenaline_acr.dose_max_mg"))
+    return dose, dose / valeur("adrenaline_acr.dilution_mg_ml")
+
+
+def doses_isr(poids):
+    poids = np.asarray(poids, dtype=float)
+    return {
+        "propofol": (poids * 2, poids * 3),
+        "etomidate": poids * 0.3,
+        "ketamine": (poids * 1, poids * 3),
+        "fentanyl": (poids * 2, poids * 3),
+        "rocuronium": (poids * 0.6, poids * 1.2),
+    }
+
+
+def debits_vasoactifs(poids):
+    """Débits min/max (ml/h) des vasoactifs en seringue de 50 ml."""
+    poids = np.asarray(poids, dtype=float)
+    # Concentrations en mcg/ml (mg dans 50 ml). Seules les seringues utilisées
+    # sont lues, pour que l'invalidation ne touche que les poids concernés.
+    petit = poids < valeur("noradrenaline.seuil_poids_kg")
+    nora_petit = valeur("noradrenaline.mg_50ml_petit") if petit.any() else 0
+    nora_grand = valeur("noradrenaline.mg_50ml_grand") if not petit.all() else 0
+    nora_c = np.where(petit, nora_petit, nora_grand) * 1000 / 50
+    adre_c = valeur("adrenaline_sap.mg_50ml") * 1000 / 50
+    dobu_c = valeur("dobutamine.mg_50ml") * 1000 / 50
+    return {
+        "noradrenaline": ((0.01 * poids * 60) / nora_c, (3.0 * poids * 60) / nora_c),
+        "adrenaline": ((0.01 * poids * 60) / adre_c, (1.0 * poids * 60) / adre_c),
+        "dobutamine": ((2.5 * poids * 60) / dobu_c, (20.0 * poids * 60) / dobu_c),
+    }
+
+
+def ration_base(poids):
+    """Holliday-Segar 4-2-1 plafonné (formulaire) : (débit ml/h, volume/24h, plafonné)."""
+    poids = np.asarray(poids, dtype=float)
+    plafond = valeur("holliday_segar.plafond_ml_j")
+    base_rate = np.select(
+        [poids <= 10, poids <= 20],
+        [4 * poids, 40 + (2 * (poids - 10))],
+        60 + (1 * (poids - 20)),
+    )
+    base_daily = base_rate * 24
+    is_capped = base_daily > plafond
+    base_daily = np.where(is_capped, plafond, base_daily)
+    base_rate = np.where(is_capped, round(plafond / 24, 1), base_rate)
+    return base_rate, base_daily, is_capped
+
+
+# --- SECTION 1 : INTUBATION ---
+def section_intubation(poids_retenu, total_months):
+    age_years_float, _ = decomposer_age(total_months)
+
+    if age_years_float < 2: lame = "Taille 1"
+    elif 2 <= age_years_float <= 5: lame = "Taille 2"
+    elif 5 < age_years_float <= 12: lame = "Taille 2 ou 3"
+    else: lame = "Taille 3 ou 4"
+
+    if total_months < 12: sonde_id = 3.5
+    else: sonde_id = (age_years_float / 4.0) + 3.5
+
+    # Arrondi au 0.5 le plus proche
+    sonde_id = round(sonde_id * 2) / 2
+
+    fixation = round(sonde_id * 3, 1)
+
+    if poids_retenu < 6: guedel = "00 (Bleu)"
+    elif poids_retenu < 10: guedel = "0 (Noir)"
+    elif poids_retenu < 15: guedel = "1 (Blanc)"
+    elif poids_retenu < 25: guedel = "2 (Vert)"
+    elif poids_retenu < 50: guedel = "3 (Orange)"
+    else: guedel = "4 (Rouge)"
+
+    aspir_sz = sonde_id * 2
+    if aspir_sz <= 6: aspir = "6 Fr (Vert clair)"
+    elif aspir_sz <= 8: aspir = "8 Fr (Bleu)"
+    elif aspir_sz <= 10: aspir = "10 Fr (Noir)"
+    elif aspir_sz <= 12: aspir = "12 Fr (Blanc)"
+    else: aspir = "14 Fr (Vert foncé)"
+
+    tab_intub = Tableau.depuis_colonnes({
+        "Paramètre": ["Sonde (Ballonnet)", "Fixation (lèvres)", "Lame", "Guedel", "Sonde Aspiration", "Pression Ballonnet"],
+        "Valeur": [f"Taille {sonde_id}", f"{fixation} cm", lame, guedel, aspir, "20-30 cmH2O"]
+    })
+    return [Section("1. Intubation", "1. 🌬️ Intubation & Voies Aériennes", tab_intub, "Paramètre")]
+
+
+# --- SECTION 2 : PHYSIO ---
+def section_physio(poids_retenu, total_months):
+    # A. Détermination des constantes normales selon l'âge TOTAL (Mois)
+    if total_months < 12:
+        # Nourrisson < 1 an
+        fc_range = "100 - 150 bpm"
+        fr_range_val = (30, 60)
+        pas_range = "70 - 90 mmHg"
+        pad_range = "40 - 55 mmHg"
+        pam_range = "50 - 65 mmHg"
+        vol_sang_ratio = 80
+
+    elif 12 <= total_months < 36:
+        # Bambin (1 à 3 ans)
+        fc_range = "90 - 140 bpm"
+        fr_range_val = (24, 40)
+        pas_range = "80 - 100 mmHg"
+        pad_range = "50 - 65 mmHg"
+        pam_range = "60 - 75 mmHg"
+        vol_sang_ratio = 80
+
+    elif 36 <= total_months < 72:
+        # Préscolaire (3 à 6 ans)
+        fc_range = "80 - 130 bpm"
+        fr_range_val = (22, 34)
+        pas_range = "80 - 110 mmHg"
+        pad_range = "55 - 70 mmHg"
+        pam_range = "65 - 80 mmHg"
+        vol_sang_ratio = 75
+
+    elif 72 <= total_months < 144:
+        # Scolaire (6 à 12 ans)
+        fc_range = "70 - 120 bpm"
+        fr_range_val = (18, 30)
+        pas_range = "90 - 120 mmHg"
+        pad_range = "60 - 75 mmHg"
+        pam_range = "70 - 90 mmHg"
+        vol_sang_ratio = 75
+
+    else:
+        # Adolescent (> 12 ans)
+        fc_range = "60 - 100 bpm"
+        fr_range_val = (12, 16)
+        pas_range = "100 - 130 mmHg"
+        pad_range = "65 - 80 mmHg"
+        pam_range = "80 - 100 mmHg"
+        vol_sang_ratio = 75
+
+    # B. Calculs Volumétriques
+    vt_min = round(poids_retenu * 4, 1)
+    vt_max = round(poids_retenu * 8, 1)
+    ebv = round(poids_retenu * vol_sang_ratio, 0)
+
+    vm_min_l = round((vt_min * fr_range_val[0]) / 1000, 1)
+    vm_max_l = round((vt_max * fr_range_val[1]) / 1000, 1)
+
+    data_physio = {
+        "Paramètre": [
+            "Fréquence Cardiaque (FC)",
+            "Pression Artérielle (PAS / PAD)",
+            "Pression Moyenne (PAM)",
+            "Fréquence Respiratoire (FR)",
+            "Volume Courant (Vt 4-8 ml/kg)",
+            "Ventilation Minute (Vm)",
+            f"Masse Sanguine ({vol_sang_ratio} ml/kg)",
+            "Gazométrie : pH (Art / Vein)",
+            "Gazométrie : PCO2 (Art / Vein)",
+            "Gazométrie : PO2 (Art / Vein)",
+            "Gazométrie : HCO3- (Bicar)",
+            "Gazométrie : Lactates"
+        ],
+        "Valeur Normale / Cible": [
+            fc_range,
+            f"{pas_range} / {pad_range}",
+            pam_range,
+            f"{fr_range_val[0]} - {fr_range_val[1]} cpm",
+            f"{vt_min} - {vt_max} ml",
+            f"{vm_min_l} - {vm_max_l} L/min",
+            f"~ {int(ebv)} ml",
+            "7.35-7.45  /  7.32-7.43",
+            "35-45 mmHg  /  38-50 mmHg",
+            "80-100 mmHg /  30-50 mmHg",
+            "22 - 26 mmol/L",
+            "< 2.0 mmol/L"
+        ]
+    }
+
+    tab_physio = Tableau.depuis_colonnes(data_physio)
+    return [Section("2. Physiologie & Gazo", "2. 📊 Paramètres Physiologiques", tab_physio, "Paramètre")]
+
+
+# --- SECTION 3 : ACR ---
+def section_acr(poids_retenu, total_months):
+    adre_dose, adre_vol = (float(x) for x in dose_adre_acr(poids_retenu))
+    amio_dose = min(poids_retenu * 5, valeur("amiodarone.dose_max_mg"))
+    amio_vol = amio_dose / valeur("amiodarone.concentration_mg_ml")
+    lido_dose = min(poids_retenu * 1.5, valeur("lidocaine.dose_max_mg"))
+    lido_vol = lido_dose / valeur("lidocaine.concentration_mg_ml")
+    choc_min = round(poids_retenu * 2, 0)
+    choc_max = round(poids_retenu * 4, 0)
+
+    data_acr = {
+        "Médicament / Geste": [
+            "Adrénaline (IV/IO)",
+            "Amiodarone (Bolus)",
+            "Lidocaïne (Bolus)",
+            "Défibrillation (Choc)"
+        ],
+        "Présentation & Dilution": [
+            valeur("adrenaline_acr.presentation"),
+            valeur("amiodarone.presentation"),
+            valeur("lidocaine.presentation"),
+            "-"
+        ],
+        "Posologie/kg": [
+            "0.01 mg/kg",
+            "5 mg/kg",
+            "1.5 mg/kg",
+            "2 - 4 J/kg"
+        ],
+        "Dose à administrer": [
+            f"{round(adre_dose, 3)} mg  =  {round(adre_vol, 2)} ml",
+            f"{int(amio_dose)} mg  =  {round(amio_vol, 1)} ml",
+            f"{int(lido_dose)} mg  =  {round(lido_vol, 1)} ml",
+            f"{int(choc_min)} - {int(choc_max)} Joules"
+        ]
+    }
+    tab_acr = Tableau.depuis_colonnes(data_acr)
+    return [Section("3. ACR", "3. 💔 Arrêt Cardio-Respiratoire", tab_acr, "Médicament / Geste")]
+
+
+# --- SECTION 4 : DROGUES D'URGENCE ---
+def section_urgences(poids_retenu, total_months):
+    age_years_float, _ = decomposer_age(total_months)
+
+    atro_brut = poids_retenu * 0.02
+    if atro_brut < 0.1: atro_dose = 0.1
+    elif atro_brut > 0.5 and age_years_float < 12: atro_dose = 0.5
+    elif atro_brut > 1.0: atro_dose = 1.0
+    else: atro_dose = atro_brut
+
+    atro_vol = atro_dose / valeur("atropine.concentration_mg_ml")
+    ephed_dose = min(poids_retenu * 0.2, valeur("ephedrine.dose_max_mg"))
+    ephed_vol = ephed_dose / valeur("ephedrine.dilution_mg_ml")
+    ca_vol = min(poids_retenu * 0.5, valeur("calcium.volume_max_ml"))
+    mg_min = round(poids_retenu * 25, 0)
+    mg_max = min(round(poids_retenu * 50, 0), valeur("magnesium.dose_max_mg"))
+    mg_vol_min = round(mg_min / valeur("magnesium.concentration_mg_ml"), 1)
+    mg_vol_max = round(mg_max / valeur("magnesium.concentration_mg_ml"), 1)
+    cv_min = round(poids_retenu * 0.5, 0)
+    cv_max = round(poids_retenu * 2, 0)
+
+    data_urg = {
+        "Médicament / Geste": [
+            "Atropine",
+            "Ephédrine",
+            "Gluconate de Calcium 10%",
+            "Sulfate de Magnésium 15%",
+            "Cardioversion Sync."
+        ],
+        "Présentation & Dilution": [
+            valeur("atropine.presentation"),
+            valeur("ephedrine.presentation"),
+            "Amp 10% (0.5 ml/kg)",
+            valeur("magnesium.presentation"),
+            "-"
+        ],
+        "Posologie/kg": [
+            "0.02 mg/kg (Min 0.1mg)",
+            "0.2 mg/kg",
+            "0.5 ml/kg",
+            "25 - 50 mg/kg",
+            "0.5 - 2 J/kg"
+        ],
+        "Dose à administrer": [
+            f"{round(atro_dose, 2)} mg  =  {round(atro_vol, 2)} ml",
+            f"{round(ephed_dose, 1)} mg  =  {round(ephed_vol, 1)} ml",
+            f"{round(ca_vol, 1)} ml (direct)",
+            f"{int(mg_min)}-{int(mg_max)} mg = {mg_vol_min}-{mg_vol_max} ml",
+            f"{int(cv_min)} - {int(cv_max)} Joules"
+        ]
+    }
+    tab_urg = Tableau.depuis_colonnes(data_urg)
+    return [Section("4. Urgences", "4. ⚡ Drogues d'Urgence", tab_urg, "Médicament / Geste")]
+
+
+# --- SECTION 5 : ISR ---
+def section_isr(poids_retenu, total_months):
+    isr = doses_isr(poids_retenu)
+    propofol_min = round(float(isr["propofol"][0]), 0)
+    propofol_max = round(float(isr["propofol"][1]), 0)
+    etomidate_dose = round(float(isr["etomidate"]), 1)
+    keta_min = round(float(isr["ketamine"][0]), 0)
+    keta_max = round(float(isr["ketamine"][1]), 0)
+    fenta_min = round(float(isr["fentanyl"][0]), 0)
+    fenta_max = round(float(isr["fentanyl"][1]), 0)
+    rocu_min = round(float(isr["rocuronium"][0]), 1)
+    rocu_max = round(float(isr["rocuronium"][1]), 1)
+
+    data_isr = {
+        "Médicament": [
+            "Propofol",
+            "Etomidate",
+            "Kétamine",
+            "Fentanyl",
+            "Rocuronium (Esmeron)"
+        ],
+        "Concentration (Réf)": [
+            valeur("propofol.concentration"),
+            valeur("etomidate.concentration"),
+            valeur("ketamine.concentration"),
+            valeur("fentanyl.concentration"),
+            valeur("rocuronium.concentration")
+        ],
+        "Posologie/kg": [
+            "2 - 3 mg/kg",
+            "0.3 mg/kg",
+            "1 - 3 mg/kg",
+            "2 - 3 mcg/kg",
+            "0.6 - 1.2 mg/kg"
+        ],
+        "Dose à administrer": [
+            f"{int(propofol_min)} - {int(propofol_max)} mg",
+            f"{etomidate_dose} mg",
+            f"{int(keta_min)} - {int(keta_max)} mg",
+            f"{int(fenta_min)} - {int(fenta_max)} mcg (gamma)",
+            f"{rocu_min} - {rocu_max} mg"
+        ]
+    }
+
+    tab_isr = Tableau.depuis_colonnes(data_isr)
+    return [Section("5. ISR", "5. 💉 Induction Séquence Rapide", tab_isr, "Médicament")]
+
+
+# --- SECTION 6 : SEDATION ---
+def section_sedation(poids_retenu, total_months):
+    avant = [("markdown", "**A. Midazolam + Fentanyl**")]
+
+    if poids_retenu < 20:
+        # LOGIQUE < 20 KG
+        mida_qty = round(poids_retenu * 2, 1)
+        fenta_qty = round(poids_retenu * 25, 1)
+
+        avant.append(("info", f"""
+        **PROTOCOLE < 20 KG (Dilution Spécifique)**
+        * **Midazolam :** 2 x Poids = **{mida_qty} mg**
+        * **Fentanyl :** 25 x Poids = **{fenta_qty} mcg**
+        * *Compléter SAP 50 ml avec SSI/G5*
+        """))
+        avant.append(("error", "⛔ Ne jamais dépasser 10 ml/h"))
+
+        # Titre PDF avec la dilution calculée
+        titre_pdf_sedation = f"6. Sédation (Dilution: Midaz {mida_qty}mg + Fenta {fenta_qty}mcg / 50ml)"
+
+        # Tableau 1 à 10 ml/h
+        vitesses = list(range(1, 11))
+        data_sedation = []
+        lignes_alerte = []
+        for v in vitesses:
+            dose_mida = round(v * 0.04, 2)
+            dose_fenta = round(v * 0.5, 1)
+            alert = "⚠️" if (dose_mida > 0.4 or dose_fenta > 5) else ""
+            if alert: lignes_alerte.append(len(data_sedation))
+            data_sedation.append([f"{v} ml/h {alert}", f"{dose_mida} mg/kg/h", f"{dose_fenta} mcg/kg/h"])
+
+        tab_sed = Tableau.depuis_lignes(data_sedation, colonnes=["Vitesse", "Dose Midaz", "Dose Fenta"], alertes=lignes_alerte)
+
+    else:
+        # LOGIQUE >= 20 KG
+        midaz_std = valeur("sedation.midazolam_std_mg")
+        fenta_std = valeur("sedation.fentanyl_std_mcg")
+        avant.append(("info", f"**PROTOCOLE ≥ 20 KG (Dilution Standard)**\n* Midazolam {midaz_std}mg + Fentanyl {fenta_std}mcg QSP 50ml"))
+
+        # Débits déduits des concentrations du formulaire (50/500 -> 1 mg/ml et 10 mcg/ml)
+        midaz_mg_ml = midaz_std / 50
+        fenta_par_mg_midaz = fenta_std / midaz_std  # mcg de fentanyl délivrés par mg de midazolam
+
+        vitesse_max_safe = round(poids_retenu * 0.4 / midaz_mg_ml, 1)
+        avant.append(("error", f"⛔ Max **{vitesse_max_safe} ml/h** (correspond à 0.4 mg/kg/h)"))
+
+        # Titre PDF avec la dilution standard
+        titre_pdf_sedation = f"6. Sédation (Dilution Std: Midaz {midaz_std}mg + Fenta {fenta_std}mcg / 50ml)"
+
+        # Cibles incluant 0.4
+        cibles_mida = [0.05, 0.1, 0.15, 0.2, 0.25, 0.3, 0.35, 0.4]
+        data_sedation_grand = []
+        for c in cibles_mida:
+            c_fenta = round(c * fenta_par_mg_midaz, 3)
+            vit = round(c * poids_retenu / midaz_mg_ml, 1)
+            data_sedation_grand.append([f"{c} mg/kg/h", f"{c_fenta} mcg/kg/h", f"**{vit} ml/h**"])
+
+        tab_sed = Tableau.depuis_lignes(data_sedation_grand, colonnes=["Cible Midaz", "Cible Fenta", "Vitesse à régler"])
+
+    tab_prop = Tableau.depuis_lignes([["Propofol", "1-4 mg/kg/h", f"**{int(poids_retenu)} - {int(poids_retenu*4)} mg/h** (soit {round(poids_retenu/10,1)} - {round(poids_retenu*4/10,1)} ml/h)"]], colonnes=["Drogue", "Poso", "Débit"])
+
+    return [
+        Section(titre_pdf_sedation, "6. 💤 Sédation Continue", tab_sed, tab_sed.colonnes[0], tuple(avant)),
+        Section("6b. Propofol", "", tab_prop, "Drogue", (
+            ("markdown", "**B. Propofol (Pur 10 mg/ml)**"),
+            ("warning", "⚠️ Changer seringue + prolongateur / 12h. Max 4 mg/kg/h (PRIS)"),
+        )),
+    ]
+
+
+# --- SECTION 7 : VASOACTIFS ---
+def section_vasoactifs(poids_retenu, total_months):
+    if poids_retenu < valeur("noradrenaline.seuil_poids_kg"): nora_mg = valeur("noradrenaline.mg_50ml_petit")
+    else: nora_mg = valeur("noradrenaline.mg_50ml_grand")
+    nora_p = f"{nora_mg:g}mg/50ml ({nora_mg / valeur('noradrenaline.mg_par_ampoule'):g} amp)"
+
+    debits = debits_vasoactifs(poids_retenu)
+    nora_min, nora_max = (float(x) for x in debits["noradrenaline"])
+    adre_min, adre_max = (float(x) for x in debits["adrenaline"])
+    dobu_min, dobu_max = (float(x) for x in debits["dobutamine"])
+
+    tab_vaso = Tableau.depuis_lignes([
+        ["Noradrénaline", nora_p, "0.01-3 mcg/kg/min", f"{round(nora_min,2)} - {round(nora_max,1)} ml/h"],
+        ["Adrénaline", f"{valeur('adrenaline_sap.mg_50ml'):g}mg/50ml", "0.01-1 mcg/kg/min", f"{round(adre_min,2)} - {round(adre_max,1)} ml/h"],
+        ["Dobutamine", f"{valeur('dobutamine.mg_50ml'):g}mg/50ml", "2.5-20 mcg/kg/min", f"{round(dobu_min,2)} - {round(dobu_max,1)} ml/h"]
+    ], colonnes=["Drogue", "Prép (50ml)", "Poso", "Vitesse"])
+    return [Section("7. Vasoactifs", "7. 💓 Vasoactifs (Noradré/Adré/Dobu)", tab_vaso, "Drogue")]
+
+
+# --- SECTION 8 : REMPLISSAGE ---
+def section_remplissage(poids_retenu, total_months):
+    bolus_10 = int(poids_retenu * 10)
+    bolus_20 = int(poids_retenu * 20)
+    tab_remp = Tableau.depuis_colonnes({
+        "Objectif": ["10 ml/kg", "20 ml/kg"],
+        "Volume": [f"**{bolus_10} ml**", f"**{bolus_20} ml**"],
+        "Durée": ["15 min", "15 min"]
+    })
+    return [Section("8. Remplissage", "8. 💧 Remplissage Vasculaire", tab_remp, "Objectif", (
+        ("info", "**Cristalloïdes Isotoniques :** NaCl 0.9% ou Ringer Lactate"),
+        ("warning", "⚠️ **Précautions :** Vérifier signes de surcharge."),
+    ))]
+
+
+# --- SECTION 9 : RATION DE BASE ---
+def section_ration_base(poids_retenu, total_months):
+    base_rate, base_daily, is_capped = ration_base(poids_retenu)
+    base_rate, base_daily, is_capped = float(base_rate), float(base_daily), bool(is_capped)
+
+    restr_rate = round(base_rate * 2/3, 1)
+    restr_daily = round(base_daily * 2/3, 0)
+
+    avant = [("success", "**Composition :** G5% + 4.5g NaCl + 1g KCl")]
+    if is_capped: avant.append(("warning", f"⚠️ Plafonné à {valeur('holliday_segar.plafond_ml_j')} ml/j"))
+
+    tab_base = Tableau.depuis_colonnes({
+        "Situation": ["Standard (4-2-1)", "Restriction 2/3 (SIADH, Post-op, polytrauma, choc septique, SDRA)"],
+        "Débit SAP": [f"**{base_rate} ml/h**", f"**{restr_rate} ml/h**"],
+        "Volume/24h": [f"{int(base_daily)} ml", f"{int(restr_daily)} ml"]
+    })
+    return [Section("9. Ration de Base", "9. 🍼 Ration de Base (Holliday-Segar)", tab_base, "Situation", tuple(avant))]
+
+
+# --- SECTION 10 : REHYDRATATION ---
+def section_rehydratation(poids_retenu, total_months):
+    data_rehydro = []
+    for p in [5, 10, 15]:
+        vol = poids_retenu * p * 10
+        v_tier = vol / 3.0
+        data_rehydro.append([f"{p}%", f"**{int(vol)} ml**", f"{round(v_tier/8,1)} ml/h", f"{round(v_tier/16,1)} ml/h", f"{round(v_tier/24,1)} ml/h"])
+
+    tab_rehydro = Tableau.depuis_lignes(data_rehydro, colonnes=["%", "Total 48h", "Débit H0-H8", "Débit H8-H24", "Débit H24-H48"])
+    return [Section("10. Réhydratation", "10. 🚑 Réhydratation (Déficit 48h)", tab_rehydro, "%", (
+        ("info", "Soluté : NaCl 0.9% ou RL. (Corrige le déficit uniquement)"),
+    ))]
+
+
+# --- SECTION 11 : POTASSIUM ---
+def section_potassium(poids_retenu, total_months):
+    # Préparations fixes (hors formulaire) : les vitesses max en dépendent directement
+    if poids_retenu < 20:
+        kcl_prep = "18.5ml KCl + 31.5ml SSI"
+        kcl_max = round(poids_retenu, 1)
+    else:
+        kcl_prep = "37ml KCl + 13ml SSI"
+        kcl_max = round(poids_retenu * 0.5, 1)
+
+    tab_kcl = Tableau.depuis_lignes([["Charge K+", kcl_prep, f"Max **{kcl_max} ml/h**"]], colonnes=["Type", "Seringue 50ml", "Vitesse Max"])
+    return [Section("11. Potassium", "11. ⚠️ Charge Potassique (VVC !)", tab_kcl, "Type", (
+        ("error", f"⛔ VVC UNIQUEMENT. Vitesse Max : {kcl_max} ml/h"),
+    ))]
+
+
+# --- SECTION 12 : ANALGÉSIE ---
+def section_analgesie(poids_retenu, total_months):
+    # Morphine Bolus: Plafond du formulaire (3mg)
+    morph_max = valeur("morphine.bolus_max_mg")
+    raw_m_min = poids_retenu * 0.05
+    raw_m_max = poids_retenu * 0.1
+    morph_bolus_min = round(min(raw_m_min, morph_max), 2)
+    morph_bolus_max = round(min(raw_m_max, morph_max), 2)
+
+    tab_analg = Tableau.depuis_lignes([
+        ["Paracétamol", "15 mg/kg", f"**{int(poids_retenu*15)} mg** / 6h ou 8h"],
+        ["Morphine (Bolus)", "0.05-0.1 mg/kg", f"**{morph_bolus_min} - {morph_bolus_max} mg** / 10-15 min"],
+        ["Morphine (SAP)", "10-40 mcg/kg/h", f"**{round(poids_retenu*0.01, 2)} - {round(poids_retenu*0.04, 2)} mg/h**"]
+    ], colonnes=["Drogue", "Réf", "Dose Calculée / Fréquence"])
+    return [Section("12. Analgésie", "12. 💊 Analgésie", tab_analg, "Drogue", apres=(
+        ("error", f"⛔ Morphine Bolus : Ne jamais dépasser {morph_max:g} mg."),
+    ))]
+
+
+# --- SECTION 13 : DIVERS ---
+def section_divers(poids_retenu, total_months):
+    _, age_years = decomposer_age(total_months)
+    data_divers = []
+
+    # 1. Oméprazole
+    calc_ome = round(poids_retenu * 1.0, 2)
+    data_divers.append(["Oméprazole", "1.0 mg/kg", f"**{calc_ome} mg** / 24h"])
+
+    # 2. Métoclopramide (Contre-indiqué < 1 an)
+    meto_d = "⛔ < 1 an" if age_years < 1 else f"**{round(poids_retenu*0.15,2)} mg** / 8h"
+    data_divers.append(["Métoclopramide", "0.15 mg/kg", meto_d])
+
+    # 3. Ondansétron
+    calc_onda = round(poids_retenu * 0.15, 2)
+    data_divers.append(["Ondansétron", "0.15 mg/kg", f"**{calc_onda} mg** / 8h (Max 8mg)"])
+
+    # 4. Méthylprédni
+    calc_methyl = round(poids_retenu * 1.0, 2)
+    data_divers.append(["Méthylprédni", "1.0 mg/kg", f"**{calc_methyl} mg** / 6h"])
+
+    # 5. Hydrocortisone
+    calc_hydro = round(poids_retenu * 1.0, 2)
+    data_divers.append(["Hydrocortisone", "1 mg/kg/dose", f"**{calc_hydro} mg** / 6h"])
+
+    # 6. Dexaméthasone
+    calc_dexa = round(poids_retenu * 0.2, 2)
+    data_divers.append(["Dexaméthasone", "0.2 mg/kg", f"**{calc_dexa} mg** / jour"])
+
+    # 7. Furosémide
+    calc_furo = round(poids_retenu * 1.0, 2)
+    data_divers.append(["Furosémide", "1.0 mg/kg", f"**{calc_furo} mg** / 6-12h"])
+
+    # 8. Mannitol 10%
+    manni_min, manni_max = int(poids_retenu*5), int(poids_retenu*10)
+    data_divers.append(["Mannitol 10%", "0.5-1 g/kg", f"**{manni_min}-{manni_max} ml** (Bolus)"])
+
+    # 9. SSH 3%
+    ssh_min = int(poids_retenu * 2)
+    ssh_max = int(poids_retenu * 5)
+    data_divers.append(["SSH 3%", "2-5 ml/kg", f"**{ssh_min} - {ssh_max} ml** (Bolus 15-20 min)"])
+
+    # 10. Bicar 1.4%
+    calc_bicar = int(poids_retenu * 6.0) # En ml directement
+    data_divers.append(["Bicar 1.4%", "6.0 ml/kg", f"**{calc_bicar} ml** (Bolus lent, à répéter si nécessaire)"])
+
+    # 11. Acide Tranex
+    calc_tranex = round(poids_retenu * 20.0, 2)
+    data_divers.append(["Acide Tranex", "20.0 mg/kg", f"**{calc_tranex} mg** (Bolus 15 min)"])
+
+    # 12. Nicardipine (Bolus)
+    loxen_min, loxen_max = round(poids_retenu*0.02,2), round(poids_retenu*0.03,2)
+    data_divers.append(["Nicardipine (Bolus)", "20-30 mcg/kg", f"**{loxen_min}-{loxen_max} mg**"])
+
+    # 13. Nicardipine (SAP)
+    loxen_sap_min = round((poids_retenu * 0.5 * 60) / 1000, 2)
+    loxen_sap_max = round((poids_retenu * 3.0 * 60) / 1000, 2)
+    data_divers.append(["Nicardipine (SAP)", "0.5-3 mcg/kg/min", f"**{loxen_sap_min} - {loxen_sap_max} mg/h** (Continu)"])
+
+    tab_divers = Tableau.depuis_lignes(data_divers, colonnes=["Médicament", "Poso Réf", "Dose Calculée"])
+    return [Section("13. Divers", "13. 🏥 Divers & Thérapeutiques", tab_divers, "Médicament")]
+
+
+# --- SECTION 14 : BIOLOGIE ---
+def section_biologie(poids_retenu, total_months):
+    # A. Définition des normes selon l'âge (Sources: Harriet Lane / CALIPER)
+    if total_months < 12: # Nourrisson
+        bio_hb = "10.0 - 12.0 g/dL"
+        bio_hte = "30 - 36 %"
+        bio_gb = "6.0 - 17.5 G/L"
+        bio_creat = "2 - 4 mg/L"
+        bio_uree = "0.10 - 0.35 g/L"
+        bio_phos = "40 - 70 mg/L" # Élevé (Croissance)
+        bio_alb = "30 - 45 g/L"
+        bio_got = "20 - 80 UI/L"
+
+    elif total_months < 144: # Enfant (1 - 12 ans)
+        bio_hb = "11.0 - 13.5 g/dL"
+        bio_hte = "33 - 40 %"
+        bio_gb = "5.5 - 15.5 G/L"
+        bio_creat = "3 - 6 mg/L"
+        bio_uree = "0.15 - 0.40 g/L"
+        bio_phos = "35 - 55 mg/L"
+        bio_alb = "35 - 50 g/L"
+        bio_got = "20 - 60 UI/L"
+
+    else: # Ado (> 12 ans)
+        bio_hb = "12.0 - 15.5 g/dL"
+        bio_hte = "36 - 46 %"
+        bio_gb = "4.5 - 11.0 G/L"
+        bio_creat = "5 - 9 mg/L" # Masse musculaire
+        bio_uree = "0.15 - 0.45 g/L"
+        bio_phos = "25 - 45 mg/L" # Adulte
+        bio_alb = "35 - 50 g/L"
+        bio_got = "15 - 40 UI/L"
+
+    # B. Tableau des données (Sans la colonne Bilan)
+    data_bio = [
+        ["Hémoglobine (Hb)", bio_hb],
+        ["Hématocrite (Hte)", bio_hte],
+        ["Globules Blancs (GB)", bio_gb],
+        ["Plaquettes", "150 - 450 G/L"],
+        ["Sodium (Na+)", "135 - 145 mmol/L"],
+        ["Potassium (K+)", "3.5 - 5.0 mmol/L"],
+        ["Chlore (Cl-)", "98 - 107 mmol/L"],
+        ["Réserve Alcaline (RA)", "22 - 26 mmol/L"],
+        ["Calcium (Ca++)", "88 - 108 mg/L"],
+        ["Phosphore", bio_phos],
+        ["Magnésium", "0.017 - 0.022 g/L"],
+        ["Albumine", bio_alb],
+        ["Urée", bio_uree],
+        ["Créatinine", bio_creat],
+        ["GOT (ASAT)", bio_got],
+        ["GPT (ALAT)", "10 - 45 UI/L"]
+    ]
+
+    tab_bio = Tableau.depuis_lignes(data_bio, colonnes=["Paramètre", "Valeurs de Référence"])
+    return [Section("14. Biologie", "14. 🩸 Constantes Biologiques (Valeurs Normales)", tab_bio, "Paramètre")]
+
+
+# Ordre d'affichage de la fiche
+SECTIONS = [
+    section_intubation,
+    section_physio,
+    section_acr,
+    section_urgences,
+    section_isr,
+    section_sedation,
+    section_vasoactifs,
+    section_remplissage,
+    section_ration_base,
+    section_rehydratation,
+    section_potassium,
+    section_analgesie,
+    section_divers,
+    section_biologie,
+]
+
+
+def calculer_fiche(poids_retenu, total_months, sections=SECTIONS):
+    """Calcule toutes les sections de la fiche (liste de Section, dans l'ordre)."""
+    fiche = []
+    for section in sections:
+        fiche.extend(section(poids_retenu, total_months))
+    return fiche
@@ -0,0 +1,115 @@
+# ==========================================
+# 🗂️ LIVRET DE CARTES "CHARIOT D'URGENCE"
+# ==========================================
+# Une page par zone de poids (codes couleur type Broselow), avec les sections
+# 1 (Intubation), 3 (ACR), 4 (Urgences) et 5 (ISR), sans identité patient.
+#
+# Les couleurs de zone sont celles du ruban Broselow, et non les codes Guedel /
+# aspiration de la section 1 : ces derniers couvrent des plages trop larges
+# pour une dose unique par carte (Guedel 2 "Vert" va de 15 à 25 kg, soit
+# ±25 % autour du milieu) et l'aspiration dépend de l'âge, pas du poids. Les
+# zones Broselow gardent la dose à ±10 % du poids réel (sauf GRIS, 3-5 kg). Les
+# couleurs Guedel / aspiration imprimées dans le tableau sont celles des
+# dispositifs, comme le rappelle chaque carte.
+#
+# Les pages sont assemblées dans un seul PDF multi-pages. Le coût est dominé
+# par le décodage du logo (~3 s, une seule fois) ; chaque page ne prend ensuite
+# que quelques millisecondes, d'où l'absence de pool de processus (chaque
+# processus devrait redécoder le logo). A relancer après toute modification
+# des doses :
+#
+#     python cartes.py [--sortie cartes_chariot.pdf]
+
+import argparse
+import datetime
+import time
+from typing import NamedTuple
+
+from calculs import (calculer_fiche, section_acr, section_intubation,
+                     section_isr, section_urgences, texte_age)
+from rendu_pdf import PDF, ajouter_sections
+
+SECTIONS_CARTE = [section_intubation, section_acr, section_urgences, section_isr]
+
+
+class Zone(NamedTuple):
+    nom: str
+    poids_min: float
+    poids_max: float
+    rgb: tuple
+    total_months: int  # Âge indicatif (taille de sonde / lame)
+
+    @property
+    def poids_calcul(self):
+        # Dose unique par zone, calculée sur le milieu de la zone
+        return (self.poids_min + self.poids_max) / 2
+
+
+NOTE_COULEURS = ("Couleur de zone : ruban Broselow. Les couleurs Guedel / aspiration du tableau "
+                 "sont celles des dispositifs, pas celles de la zone.")
+
+ZONES = [
+    Zone("GRIS", 3, 5, (160, 160, 160), 0),
+    Zone("ROSE", 6, 7, (255, 160, 190), 3),
+    Zone("ROUGE", 8, 9, (220, 40, 40), 8),
+    Zone("VIOLET", 10, 11, (140, 80, 180), 14),
+    Zone("JAUNE", 12, 14, (250, 220, 50), 24),
+    Zone("BLANC", 15, 18, (255, 255, 255), 48),
+    Zone("BLEU", 19, 23, (60, 120, 220), 72),
+    Zone("ORANGE", 24, 29, (250, 140, 30), 96),
+    Zone("VERT", 30, 36, (60, 170, 80), 132),
+]
+
+
+class CartePDF(PDF):
+    sous_titre = "Carte Chariot d'Urgence (sans identité patient)"
+
+
+def preparer_page(zone):
+    """Sections d'une page : (zone, {titre: Tableau})."""
+    fiche = calculer_fiche(zone.poids_calcul, zone.total_months, sections=SECTIONS_CARTE)
+    return zone, {section.cle: section.table for section in fiche}
+
+
+def ajouter_page(pdf, zone, data_sections, date_generation):
+    pdf.add_page()
+
+    # Bandeau couleur de la zone
+    r, g, b = zone.rgb
+    pdf.set_fill_color(r, g, b)
+    fonce = (0.299 * r + 0.587 * g + 0.114 * b) < 140
+    pdf.set_text_color(*((255, 255, 255) if fonce else (0, 0, 0)))
+    pdf.set_font("Arial", 'B', 16)
+    pdf.cell(0, 12, f"ZONE {zone.nom} : {zone.poids_min} - {zone.poids_max} kg", border=1, ln=True, align='C', fill=True)
+    pdf.set_text_color(0, 0, 0)
+
+    pdf.set_font("Arial", size=10)
+    pdf.cell(0, 7, f"Doses calculées pour {zone.poids_calcul} kg | Âge indicatif : {texte_age(zone.total_months)} | Généré le : {date_generation}", ln=True)
+    pdf.set_font("Arial", 'I', 8)
+    pdf.cell(0, 5, NOTE_COULEURS, ln=True)
+    pdf.ln(3)
+
+    ajouter_sections(pdf, data_sections)
+
+
+def generer_livret(zones=ZONES):
+    """Retourne le livret complet (bytes PDF), une page par zone."""
+    pages = [preparer_page(zone) for zone in zones]
+
+    date_generation = datetime.datetime.now().strftime('%d/%m/%Y %H:%M')
+    pdf = CartePDF()
+    for zone, data_sections in pages:
+        ajouter_page(pdf, zone, data_sections, date_generation)
+    return pdf.output(dest='S').encode('latin-1', 'replace')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Génère le livret de cartes du chariot d'urgence.")
+    parser.add_argument("--sortie", default="cartes_chariot.pdf", help="Fichier PDF de sortie")
+    args = parser.parse_args()
+
+    debut = time.perf_counter()
+    contenu = generer_livret()
+    with open(args.sortie, "wb") as f:
+        f.write(contenu)
+    print(f"{len(ZONES)} cartes -> {args.sortie} ({time.perf_counter() - debut:.2f} s)")
@@ -0,0 +1,65 @@
+# ==========================================
+# 📈 ESTIMATION DU POIDS (COURBES DE CROISSANCE)
+# ==========================================
+# Alternatives à la formule APLS : courbes OMS/CDC poids-pour-l'âge par sexe
+# et estimation par la taille (poids-pour-la-taille). Les tables de
+# donnees/ sont chargées une seule fois en tableaux numpy triés ; chaque
+# requête est une interpolation linéaire (recherche dichotomique, O(log n))
+# qui accepte un scalaire ou un tableau (calcul par lot).
+
+import os
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from calculs import estimer_poids
+
+DOSSIER_DONNEES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "donnees")
+
+SEXES = {"Garçon": "M", "Fille": "F"}
+
+
+class Estimation(NamedTuple):
+    poids: float   # Estimation retenue (médiane)
+    bas: float     # Bas de la plage plausible
+    haut: float    # Haut de la plage plausible
+    methode: str
+
+
+@lru_cache(maxsize=None)
+def charger_table(fichier, colonne):
+    """{sexe: (x, bas, median, haut)} en tableaux numpy triés sur x."""
+    df = pd.read_csv(os.path.join(DOSSIER_DONNEES, fichier), comment="#")
+    tables = {}
+    for sexe, groupe in df.groupby("sexe"):
+        groupe = groupe.sort_values(colonne)
+        tables[sexe] = tuple(groupe[c].to_numpy(dtype=float) for c in (colonne, "bas", "median", "haut"))
+    return tables
+
+
+def _interpoler(table, x, methode):
+    # Hors table : valeur bornée à la première / dernière ligne
+    abscisses, bas, median, haut = table
+    x = np.asarray(x, dtype=float)
+    valeurs = [np.interp(x, abscisses, col) for col in (median, bas, haut)]
+    if x.ndim == 0:
+        valeurs = [round(float(v), 1) for v in valeurs]
+    return Estimation(*valeurs, methode)
+
+
+def poids_par_age(total_months, sexe):
+    """Poids pour l'âge (OMS 0-5 ans, CDC au-delà) ; sexe = "M" ou "F"."""
+    return _interpoler(charger_table("poids_age.csv", "mois")[sexe], total_months, "Courbes OMS/CDC")
+
+
+def poids_par_taille(taille_cm, sexe):
+    """Poids pour la taille (estimation type Broselow) ; sexe = "M" ou "F"."""
+    return _interpoler(charger_table("poids_taille.csv", "taille_cm")[sexe], taille_cm, "Taille")
+
+
+def poids_apls(total_months):
+    """Formule APLS présentée comme une Estimation (sans plage)."""
+    poids = estimer_poids(total_months)
+    return Estimation(poids, poids, poids, "APLS")
@@ -0,0 +1,190 @@
+# ==========================================
+# 🌐 EXPORT EN SITE STATIQUE
+# ==========================================
+# Génère un site autonome (HTML + PDF optionnel) avec une fiche par point de
+# la grille âge / poids, plus une page d'index pour la sélection. Le site peut
+# être servi par n'importe quel serveur web statique ou ouvert depuis une clé
+# USB, sans aucun calcul côté serveur. La génération est parallélisée :
+#
+#     python export_statique.py [--sortie site_statique] [--pas 0.5] [--pdf] [--workers 4]
+
+import argparse
+import html
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from calculs import calculer_fiche, texte_age
+from croissance import poids_par_age
+from rendu_pdf import create_pdf
+
+# Âges proposés : 0-23 mois puis 2-16 ans (comme la saisie de la fiche)
+AGES_MOIS = list(range(0, 24)) + [annees * 12 for annees in range(2, 17)]
+
+# Bande couverte autour de la plage OMS/CDC P3-P97 (dénutrition, obésité)
+FACTEUR_BAS = 0.5
+FACTEUR_HAUT = 1.5
+
+AVERTISSEMENT = ("Aide au calcul à usage interne du service de Réanimation Mère-Enfant (CHU Hassan II, Fès). "
+                 "Ne remplace en aucun cas le jugement clinique.")
+
+STYLE = """body{font-family:Arial,sans-serif;margin:1em auto;max-width:60em;padding:0 1em}
+h1{font-size:1.4em}h2{font-size:1.1em;margin-top:1.5em}
+table{border-collapse:collapse;width:100%;font-size:.9em}th,td{border:1px solid #999;padding:.3em}
+th{background:#eee}.info{background:#e8f0fe}.warning{background:#fff4d6}.error{background:#fde2e2}
+.success{background:#e3f6e8}.alerte td{background:#fde2e2;font-weight:bold}.info,.warning,.error,.success{padding:.4em .8em;margin:.4em 0;border-radius:4px}
+.avert{font-size:.85em;color:#a33}
+"""
+
+
+def grille(pas=0.5):
+    """[(total_months, [poids...])] : de 0.5 x P3 à 1.5 x P97 (OMS/CDC, deux sexes)."""
+    # Les noms de fichiers portent le poids à 0.1 kg près
+    if pas <= 0 or abs(pas * 10 - round(pas * 10)) > 1e-9:
+        raise ValueError(f"Le pas doit être un multiple positif de 0.1 kg (reçu : {pas})")
+    points = []
+    for mois in AGES_MOIS:
+        bas = FACTEUR_BAS * min(poids_par_age(mois, sexe).bas for sexe in ("M", "F"))
+        haut = FACTEUR_HAUT * max(poids_par_age(mois, sexe).haut for sexe in ("M", "F"))
+        debut = max(pas, round(bas / pas) * pas)
+        nb = int(round((haut - debut) / pas)) + 1
+        points.append((mois, [round(debut + i * pas, 1) for i in range(nb)]))
+    return points
+
+
+def nom_fiche(total_months, poids):
+    return f"{total_months:03d}m_{poids:.1f}kg"
+
+
+def en_html(texte):
+    """Markdown simple des sections (gras, italique, puces) -> HTML."""
+    lignes = []
+    for ligne in html.escape(str(texte)).strip().splitlines():
+        ligne = ligne.strip()
+        ligne = re.sub(r"\*\*(.+?)\*\*", r"<b>\1</b>", ligne)
+        if ligne.startswith("* "):
+            ligne = "&bull; " + ligne[2:]
+        ligne = re.sub(r"\*(.+?)\*", r"<i>\1</i>", ligne)
+        lignes.append(ligne)
+    return "<br>".join(l for l in lignes if l)
+
+
+def page_fiche(total_months, poids, avec_pdf):
+    age = texte_age(total_months)
+    corps = [f"<h1>Fiche : {age}, {poids} kg</h1>",
+             f'<p><a href="../index.html">&larr; Index</a>'
+             + (f' | <a href="{nom_fiche(total_months, poids)}.pdf">PDF</a>' if avec_pdf else "") + "</p>",
+             f'<p class="avert">{AVERTISSEMENT}</p>']
+    for section in calculer_fiche(poids, total_months):
+        if section.titre:
+            corps.append(f"<h2>{html.escape(section.titre)}</h2>")
+        corps += [f'<div class="{type_msg}">{en_html(texte)}</div>' for type_msg, texte in section.avant]
+        tableau = section.table
+        corps.append("<table><tr>" + "".join(f"<th>{html.escape(str(c))}</th>" for c in tableau.colonnes) + "</tr>")
+        for n, ligne in enumerate(tableau.lignes):
+            classe = ' class="alerte"' if n in tableau.alertes else ""
+            corps.append(f"<tr{classe}>" + "".join(f"<td>{en_html(v)}</td>" for v in ligne) + "</tr>")
+        corps.append("</table>")
+        corps += [f'<div class="{type_msg}">{en_html(texte)}</div>' for type_msg, texte in section.apres]
+    return ('<!DOCTYPE html><html lang="fr"><head><meta charset="utf-8">'
+            '<meta name="viewport" content="width=device-width,initial-scale=1">'
+            f'<title>Pédicalcul - {age} - {poids} kg</title><link rel="stylesheet" href="../style.css"></head>'
+            "<body>" + "\n".join(corps) + "</body></html>")
+
+
+def generer_lot(args):
+    """Écrit les fiches d'un âge (exécuté dans un processus du pool)."""
+    dossier, total_months, liste_poids, avec_pdf = args
+    for poids in liste_poids:
+        base = os.path.join(dossier, "fiches", nom_fiche(total_months, poids))
+        with open(base + ".html", "w", encoding="utf-8") as f:
+            f.write(page_fiche(total_months, poids, avec_pdf))
+        if avec_pdf:
+            p_info = {"nom": "", "ip": "", "date_adm": "", "age_str": texte_age(total_months), "poids": poids}
+            pdf_data_store = {s.cle: s.table for s in calculer_fiche(poids, total_months)}
+            with open(base + ".pdf", "wb") as f:
+                f.write(create_pdf(p_info, pdf_data_store))
+    return len(liste_poids)
+
+
+def page_index(points, pas):
+    ages = "".join(f'<option value="{mois}">{texte_age(mois)}</option>' for mois, _ in points)
+    table_poids = json.dumps({mois: liste for mois, liste in points})
+    liens = "".join(
+        f"<details><summary>{texte_age(mois)}</summary>"
+        + " ".join(f'<a href="fiches/{nom_fiche(mois, p)}.html">{p}</a>' for p in liste)
+        + "</details>"
+        for mois, liste in points
+    )
+    script = f"""<script>
+var POIDS = {table_poids};
+var PAS = {pas};
+function ouvrir() {{
+  var mois = document.getElementById('age').value;
+  var p = parseFloat(document.getElementById('poids').value.replace(',', '.'));
+  var liste = POIDS[mois];
+  var alerte = document.getElementById('alerte');
+  alerte.hidden = true;
+  if (isNaN(p)) {{ return false; }}
+  var proche = liste.reduce(function (a, b) {{ return Math.abs(b - p) < Math.abs(a - p) ? b : a; }});
+  if (Math.abs(proche - p) > PAS / 2 + 1e-9) {{
+    // Hors de la grille précalculée : jamais de fiche pour un autre poids
+    alerte.textContent = '⛔ Aucune fiche précalculée pour ' + p + ' kg à cet âge (fiches de '
+      + liste[0] + ' à ' + liste[liste.length - 1] + ' kg). Utiliser l’application de calcul.';
+    alerte.hidden = false;
+    return false;
+  }}
+  var nom = ('00' + mois).slice(-3) + 'm_' + proche.toFixed(1) + 'kg.html';
+  window.location.href = 'fiches/' + nom;
+  return false;
+}}
+</script>"""
+    return ('<!DOCTYPE html><html lang="fr"><head><meta charset="utf-8">'
+            '<meta name="viewport" content="width=device-width,initial-scale=1">'
+            '<title>Pédicalcul - Réa Mère Enfant - CHU Fès</title><link rel="stylesheet" href="style.css"></head><body>'
+            "<h1>Pédicalcul - Réa Mère Enfant - CHU Fès</h1>"
+            f'<p class="avert">{AVERTISSEMENT}</p>'
+            '<form onsubmit="return ouvrir()">'
+            f'<label>Âge : <select id="age">{ages}</select></label> '
+            f'<label>Poids (kg) : <input id="poids" inputmode="decimal" size="6"></label> '
+            '<button type="submit">Ouvrir la fiche</button></form>'
+            '<p id="alerte" class="error" hidden></p>'
+            f"<p>Poids arrondi au pas de {pas} kg le plus proche. Fiches disponibles de {FACTEUR_BAS:g} x P3 "
+            f"à {FACTEUR_HAUT:g} x P97 (OMS/CDC) pour l'âge : en dehors, aucune fiche n'est proposée.</p>"
+            f"<h2>Toutes les fiches</h2>{liens}{script}</body></html>")
+
+
+def exporter(dossier, pas=0.5, avec_pdf=False, workers=None):
+    """Génère le site complet ; retourne le nombre de fiches."""
+    points = grille(pas)
+    os.makedirs(os.path.join(dossier, "fiches"), exist_ok=True)
+    with open(os.path.join(dossier, "style.css"), "w", encoding="utf-8") as f:
+        f.write(STYLE)
+    with open(os.path.join(dossier, "index.html"), "w", encoding="utf-8") as f:
+        f.write(page_index(points, pas))
+
+    # Un lot par âge : les âges élevés (plages larges) partent en premier
+    lots = sorted(((dossier, mois, liste, avec_pdf) for mois, liste in points), key=lambda lot: -len(lot[2]))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(generer_lot, lots))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exporte les fiches précalculées en site statique.")
+    parser.add_argument("--sortie", default="site_statique", help="Dossier de sortie")
+    parser.add_argument("--pas", type=float, default=0.5, help="Pas de poids en kg (défaut : 0.5)")
+    parser.add_argument("--pdf", action="store_true", help="Générer aussi le PDF de chaque fiche")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus (défaut : nombre de CPU)")
+    args = parser.parse_args()
+
+    try:
+        grille(args.pas)
+    except ValueError as e:
+        parser.error(str(e))
+
+    debut = time.perf_counter()
+    nb = exporter(args.sortie, pas=args.pas, avec_pdf=args.pdf, workers=args.workers)
+    duree = time.perf_counter() - debut
+    print(f"{nb} fiches -> {args.sortie}/ en {duree:.1f} s ({1000 * duree / nb:.1f} ms/fiche)")
@@ -0,0 +1,111 @@
+# ==========================================
+# 💊 FORMULAIRE (CONCENTRATIONS, PLAFONDS, PRÉSENTATIONS)
+# ==========================================
+# Les valeurs de référence de la pharmacie sont dans donnees/formulaire.json.
+# Les calculs les lisent via valeur(cle) ; suivre_lectures() permet de savoir
+# quelles entrées une section a utilisées, pour n'invalider que les sections
+# concernées lors d'une mise à jour.
+
+import json
+import math
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+FICHIER_FORMULAIRE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "donnees", "formulaire.json")
+FACTEUR_MAX = 10  # Une valeur numérique ne peut varier que d'un facteur 10 par mise à jour (erreur de saisie)
+
+with open(FICHIER_FORMULAIRE, encoding="utf-8") as f:
+    _valeurs = json.load(f)
+
+_verrou = threading.Lock()
+_lectures = ContextVar("lectures_formulaire", default=None)
+
+
+def valeur(cle):
+    """Valeur courante d'une entrée (enregistrée si un suivi est actif)."""
+    lues = _lectures.get()
+    if lues is not None:
+        lues.add(cle)
+    return _valeurs[cle]
+
+
+def valeurs():
+    return dict(_valeurs)
+
+
+def _verifier(cle, ancienne, nouvelle):
+    """Lève ValueError si la nouvelle valeur est inutilisable par les calculs."""
+    if isinstance(ancienne, str):
+        if not isinstance(nouvelle, str) or not nouvelle.strip():
+            raise ValueError(f"Texte non vide attendu pour {cle}")
+        return
+    if isinstance(nouvelle, bool) or not isinstance(nouvelle, (int, float)) or not math.isfinite(nouvelle):
+        raise ValueError(f"Valeur numérique attendue pour {cle}")
+    # Concentrations, dilutions, plafonds et seuils : tous strictement positifs
+    if nouvelle <= 0:
+        raise ValueError(f"Valeur strictement positive attendue pour {cle} (reçu : {nouvelle})")
+    if not ancienne / FACTEUR_MAX <= nouvelle <= ancienne * FACTEUR_MAX:
+        raise ValueError(f"Valeur hors plage pour {cle} : {nouvelle} "
+                         f"(attendu entre {ancienne / FACTEUR_MAX:g} et {ancienne * FACTEUR_MAX:g})")
+
+
+@contextmanager
+def suivre_lectures():
+    """Collecte les clés lues par valeur() dans le bloc (par thread)."""
+    lues = set()
+    jeton = _lectures.set(lues)
+    try:
+        yield lues
+    finally:
+        _lectures.reset(jeton)
+
+
+def modifier(modifications, enregistrer=True):
+    """Applique {cle: nouvelle valeur} ; retourne {cle: (ancienne, nouvelle)} des seules vraies modifications.
+
+    Toutes les valeurs sont vérifiées avant application : une seule valeur
+    invalide (ValueError) rejette l'ensemble de la mise à jour.
+    """
+    global _valeurs
+    with _verrou:
+        changements = {}
+        for cle, nouvelle in modifications.items():
+            if cle not in _valeurs:
+                raise ValueError(f"Entrée inconnue du formulaire : {cle}")
+            ancienne = _valeurs[cle]
+            if nouvelle != ancienne:
+                _verifier(cle, ancienne, nouvelle)
+                changements[cle] = (ancienne, nouvelle)
+        if not changements:
+            return changements
+
+        # Remplacement atomique : les lectures en cours voient l'ancien ou le nouveau dictionnaire
+        _valeurs = {**_valeurs, **{cle: nouvelle for cle, (_, nouvelle) in changements.items()}}
+        if enregistrer:
+            _enregistrer(_valeurs)
+    return changements
+
+
+def _enregistrer(contenu):
+    """Écriture atomique : fichier temporaire du même dossier puis os.replace.
+
+    Un arrêt en cours d'écriture laisse l'ancien fichier intact (il est relu
+    à l'import du module).
+    """
+    dossier = os.path.dirname(FICHIER_FORMULAIRE)
+    descripteur, temporaire = tempfile.mkstemp(prefix=".formulaire_", suffix=".json", dir=dossier)
+    try:
+        with os.fdopen(descripteur, "w", encoding="utf-8") as f:
+            json.dump(contenu, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp crée le fichier en 0600 : garder les droits de l'original
+        os.chmod(temporaire, os.stat(FICHIER_FORMULAIRE).st_mode & 0o777)
+        os.replace(temporaire, FICHIER_FORMULAIRE)
+    except BaseException:
+        os.unlink(temporaire)
+        raise
@@ -0,0 +1,63 @@
+# ==========================================
+# ⏱️ PROFILAGE À LA DEMANDE (cProfile)
+# ==========================================
+# Profile les N prochains reruns d'une session (activé par un admin dans la
+# barre latérale ou via PEDICALCUL_PROFIL=N). Chaque rerun profilé écrit un
+# fichier .prof horodaté (+ .json des entrées utilisées) dans profils/.
+# Désactivé, le coût se limite à une comparaison d'entier par rerun.
+
+import cProfile
+import datetime
+import io
+import json
+import os
+import pstats
+
+DOSSIER_PROFILS = os.environ.get("PEDICALCUL_PROFIL_DIR", "profils")
+NB_LIGNES_RESUME = 15
+
+
+class Profilage:
+    def __init__(self):
+        self.restants = int(os.environ.get("PEDICALCUL_PROFIL", "0") or 0)
+        self.profil = None
+        self.resume = ""
+        self.dernier_fichier = ""
+
+    def demarrer(self):
+        if self.profil is not None:
+            # Rerun précédent interrompu (st.rerun, st.stop, exception) avant terminer() :
+            # sa capture est abandonnée mais compte comme un rerun profilé
+            self.profil.disable()
+            self.profil = None
+            self.restants -= 1
+        if self.restants <= 0:
+            return
+        profil = cProfile.Profile()
+        try:
+            profil.enable()
+        except ValueError:
+            # Python 3.12+ : un seul profileur actif par processus (autre session en cours)
+            return
+        self.profil = profil
+
+    def terminer(self, entrees):
+        """Arrête la capture en cours, écrit le .prof et prépare le résumé."""
+        if self.profil is None:
+            return
+        self.profil.disable()
+        profil, self.profil = self.profil, None
+        self.restants -= 1
+
+        horodatage = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        os.makedirs(DOSSIER_PROFILS, exist_ok=True)
+        base = os.path.join(DOSSIER_PROFILS, f"rerun_{horodatage}")
+        profil.dump_stats(base + ".prof")
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump(entrees, f, ensure_ascii=False, default=str, indent=2)
+        self.dernier_fichier = base + ".prof"
+
+        flux = io.StringIO()
+        stats = pstats.Stats(profil, stream=flux)
+        stats.strip_dirs().sort_stats("cumulative").print_stats(NB_LIGNES_RESUME)
+        self.resume = flux.getvalue()
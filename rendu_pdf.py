@@ -0,0 +1,124 @@
+# ==========================================
+# 📄 GÉNÉRATION PDF
+# ==========================================
+
+import datetime
+from functools import lru_cache
+
+from fpdf import FPDF
+
+LOGO = 'logo.png'
+FORMAT_DATE = '%d/%m/%Y %H:%M'
+
+
+@lru_cache(maxsize=1)
+def _logo_decode():
+    # Le décodage PNG de fpdf (pur Python, ~3 s pour le logo) n'est fait
+    # qu'une fois par processus au lieu d'une fois par document
+    return FPDF()._parsepng(LOGO)
+
+
+def logo_pret():
+    """True si le logo est déjà décodé dans ce processus (PDF alors quasi gratuit)."""
+    return _logo_decode.cache_info().currsize > 0
+
+
+# --- FONCTION DE GÉNÉRATION PDF ---
+class PDF(FPDF):
+    sous_titre = 'Fiche de Calcul Automatisée'
+
+    def header(self):
+        # Paramètres : nom du fichier, x, y, largeur (en mm)
+        try:
+            if LOGO not in self.images:
+                # Copie : fpdf retire 'data' de l'entrée après écriture du document
+                self.images[LOGO] = dict(_logo_decode(), i=len(self.images) + 1)
+            self.image(LOGO, 10, 8, 20)
+        except:
+            pass # Si pas d'image, ne plante pas
+        self.set_font('Arial', 'B', 14)
+        self.cell(0, 10, 'CHU Hassan II - Réanimation Mère-Enfant', 0, 1, 'C')
+        self.set_font('Arial', 'I', 10)
+        self.cell(0, 10, self.sous_titre, 0, 1, 'C')
+        self.ln(5)
+
+    def footer(self):
+        self.set_y(-15)
+        self.set_font('Arial', 'I', 8)
+        self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
+
+
+def ajouter_sections(pdf, data_sections):
+    """Écrit les tableaux {titre: Tableau} sur la page courante."""
+    for title, tableau in data_sections.items():
+        if tableau is not None and tableau.lignes:
+            # Titre Section
+            pdf.set_font("Arial", 'B', 10)
+            pdf.set_fill_color(240, 240, 240)
+            pdf.cell(0, 7, title, ln=True, fill=True)
+
+            # Tableau
+            pdf.set_font("Arial", size=8)
+            cols = list(tableau.colonnes)
+            page_width = 190
+
+            # --- Ajustement intelligent largeur colonnes ---
+            if len(cols) == 4:
+                # Cas ACR / Urgences : On donne plus de place à la col 2 (Présentation)
+                # Col 1: 22%, Col 2: 38% (Large), Col 3: 20%, Col 4: 20%
+                col_widths = [page_width * 0.22, page_width * 0.38, page_width * 0.20, page_width * 0.20]
+
+            elif len(cols) == 3:
+                # Cas Sédation / Divers
+                col_widths = [page_width * 0.30, page_width * 0.30, page_width * 0.40]
+
+            elif len(cols) == 2:
+                # Cas Physio / Bio / Intubation
+                col_widths = [page_width * 0.40, page_width * 0.60]
+
+            elif len(cols) > 0:
+                # Fallback générique
+                col_widths = [page_width * 0.35] + [page_width * 0.65 / (len(cols)-1)] * (len(cols)-1)
+            else:
+                col_widths = [page_width]
+            # -------------------------------------------------------------
+
+            # En-têtes
+            pdf.set_font("Arial", 'B', 8)
+            for i, col in enumerate(cols):
+                pdf.cell(col_widths[i], 6, str(col), border=1, align='C')
+            pdf.ln()
+
+            # Données
+            for index, row in enumerate(tableau.lignes):
+                # Lignes en alerte (dépassement de seuil) en gras
+                pdf.set_font("Arial", 'B' if index in tableau.alertes else '', 8)
+                # L'ajustement des colonnes ci-dessus devrait suffire pour éviter le débordement
+                for i, valeur in enumerate(row):
+                    # Nettoyage
+                    val = str(valeur).replace('**', '').replace('⚠️', '!').replace('⛔', 'STOP').replace('⚡', '').replace('💧', '')
+                    pdf.cell(col_widths[i], 6, val, border=1, align='L' if i==0 else 'C')
+                pdf.ln()
+            pdf.ln(3)
+
+
+def horodatage():
+    """Date de génération imprimée sur les PDF (à la minute près)."""
+    return datetime.datetime.now().strftime(FORMAT_DATE)
+
+
+def create_pdf(patient_info, data_sections, date_generation=None):
+    pdf = PDF()
+    pdf.add_page()
+
+    # Info Patient
+    pdf.set_font("Arial", size=11)
+    pdf.cell(0, 8, f"Patient: {patient_info['nom']} | IP: {patient_info['ip']} | Admission: {patient_info['date_adm']}", ln=True)
+    pdf.cell(0, 8, f"Age: {patient_info['age_str']} | Poids: {patient_info['poids']} kg | Généré le: {date_generation or horodatage()}", ln=True)
+    pdf.line(10, 30, 200, 30)
+    pdf.ln(5)
+
+    # Sections
+    ajouter_sections(pdf, data_sections)
+
+    return pdf.output(dest='S').encode('latin-1', 'replace')
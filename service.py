@@ -0,0 +1,115 @@
+# ==========================================
+# 🛏️ TABLEAU DE SERVICE (MULTI-PATIENTS)
+# ==========================================
+# Garde la liste des lits occupés et les doses clés de chacun. Le chargement
+# initial est calculé par lot (numpy) ; ensuite seules les lignes dont le
+# poids ou l'âge a changé sont recalculées (ou toutes, si le formulaire a
+# changé une entrée utilisée par les doses clés). La fiche complète d'un lit
+# vient du cache partagé des fiches.
+
+import numpy as np
+import pandas as pd
+
+import formulaire
+from calculs import (debits_vasoactifs, dose_adre_acr, doses_isr,
+                     ration_base, texte_age)
+
+COLONNES_DOSES = [
+    "Lit", "Patient", "Âge", "Poids (kg)", "Adré ACR", "Propofol", "Kétamine",
+    "Fentanyl", "Rocuronium", "Noradré", "Adré SAP", "Dobu", "Ration base",
+]
+
+
+def doses_cles_lot(poids, total_months):
+    """Doses clés formatées pour plusieurs lits en un seul passage numpy."""
+    poids = np.asarray(poids, dtype=float)
+    adre_dose, adre_vol = dose_adre_acr(poids)
+    isr = doses_isr(poids)
+    vaso = debits_vasoactifs(poids)
+    base_rate = ration_base(poids)[0]
+
+    def plage(paire, decimales, unite):
+        mini, maxi = paire
+        if decimales == 0:
+            return [f"{int(round(a))} - {int(round(b))} {unite}" for a, b in zip(mini.tolist(), maxi.tolist())]
+        return [f"{round(a, decimales)} - {round(b, decimales)} {unite}" for a, b in zip(mini.tolist(), maxi.tolist())]
+
+    def debit(paire):
+        mini, maxi = paire
+        return [f"{round(a, 2)} - {round(b, 1)} ml/h" for a, b in zip(mini.tolist(), maxi.tolist())]
+
+    return {
+        "Âge": [texte_age(int(m)) for m in total_months],
+        "Poids (kg)": poids.tolist(),
+        "Adré ACR": [f"{round(d, 3)} mg = {round(v, 2)} ml" for d, v in zip(adre_dose.tolist(), adre_vol.tolist())],
+        "Propofol": plage(isr["propofol"], 0, "mg"),
+        "Kétamine": plage(isr["ketamine"], 0, "mg"),
+        "Fentanyl": plage(isr["fentanyl"], 0, "mcg"),
+        "Rocuronium": plage(isr["rocuronium"], 1, "mg"),
+        "Noradré": debit(vaso["noradrenaline"]),
+        "Adré SAP": debit(vaso["adrenaline"]),
+        "Dobu": debit(vaso["dobutamine"]),
+        "Ration base": [f"{r} ml/h" for r in base_rate.tolist()],
+    }
+
+
+class Service:
+    """Lits occupés du service, avec doses clés et fiches mémorisées."""
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.lits = {}  # lit -> {"nom", "total_months", "poids"}
+        self.doses = pd.DataFrame(columns=COLONNES_DOSES).set_index("Lit")
+        self.version = cache.version
+        self.dependances = frozenset()  # Entrées du formulaire lues par les doses clés
+
+    def mettre_a_jour(self, entrees):
+        """Synchronise le tableau avec les entrées [{lit, nom, total_months, poids}].
+
+        Retourne la liste des lits recalculés (tous au premier chargement).
+        """
+        # Formulaire modifié depuis le dernier calcul : tout recalculer si les doses clés en dépendent
+        if self.cache.version != self.version:
+            if self.cache.cles_modifiees_depuis(self.version) & self.dependances:
+                self.lits = {}
+                self.dependances = frozenset()
+            self.version = self.cache.version
+
+        vus = set()
+        a_calculer = []
+        for e in entrees:
+            lit = e["lit"]
+            vus.add(lit)
+            ancien = self.lits.get(lit)
+            if ancien is None or (ancien["total_months"], ancien["poids"]) != (e["total_months"], e["poids"]):
+                self.lits[lit] = {"nom": e["nom"], "total_months": e["total_months"], "poids": e["poids"]}
+                a_calculer.append(lit)
+            elif ancien["nom"] != e["nom"]:
+                # Changement d'identité seul : aucun recalcul
+                ancien["nom"] = e["nom"]
+                self.doses.loc[lit, "Patient"] = e["nom"]
+
+        for lit in [l for l in self.lits if l not in vus]:
+            del self.lits[lit]
+
+        if a_calculer:
+            with formulaire.suivre_lectures() as lues:
+                nouvelles = doses_cles_lot(
+                    [self.lits[l]["poids"] for l in a_calculer],
+                    [self.lits[l]["total_months"] for l in a_calculer],
+                )
+            # Cumul : un lot partiel ne lit que les entrées utiles à ses propres lits
+            self.dependances |= lues
+            nouvelles["Patient"] = [self.lits[l]["nom"] for l in a_calculer]
+            bloc = pd.DataFrame(nouvelles, index=pd.Index(a_calculer, name="Lit"))[COLONNES_DOSES[1:]]
+            reste = self.doses[~self.doses.index.isin(a_calculer)]
+            self.doses = pd.concat([reste, bloc]) if len(reste) else bloc
+
+        # Ordre de saisie des lits (les lits libérés disparaissent)
+        self.doses = self.doses.reindex([e["lit"] for e in entrees])
+        return a_calculer
+
+    def fiche(self, lit):
+        """Fiche complète du lit (cache partagé : pas de recalcul si déjà connue)."""
+        entree = self.lits[lit]
+        return self.cache.fiche(entree["poids"], entree["total_months"])